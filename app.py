@@ -30,11 +30,13 @@ def main():
         print(f"🌐 Base URL: {base_url}\n")
         
         # Run the core FFTE workflow
+        stats = {}
         report = run(
             spec_url=spec_url,
             base_url=base_url,
             timeout=10.0,
-            limit_endpoints=None
+            limit_endpoints=None,
+            stats=stats
         )
         
         # Format and display report
@@ -51,9 +53,12 @@ def main():
                 f.write(formatted_report)
             print(f"\n💾 Report saved to ffte_report.txt")
             
-            # Count failures
-            failure_count = sum(len(commands) for commands in report.values())
-            print(f"\n📈 Summary: Found {failure_count} failures")
+            # Failures were counted as they were classified
+            print(
+                f"\n📈 Summary: Found {stats['failures']} failures in "
+                f"{stats['tests_executed']} tests "
+                f"({stats['duplicates_skipped']} duplicate cases skipped)"
+            )
             
             return 0
         else:
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Check that run_threaded reports the same failures as the async runner.
+
+Scans one spec with run (asyncio) and with run_threaded at a single worker
+and at its default worker count, then compares failure counts per type.
+Exits non-zero on any mismatch.
+"""
+
+from __future__ import annotations
+
+import sys
+from core.runner import run, run_threaded
+
+
+def failure_counts(report: dict[str, list[str]]) -> dict[str, int]:
+    """Number of failures per failure type in a report."""
+    return {failure_type: len(curls) for failure_type, curls in sorted(report.items())}
+
+
+def main():
+    """Command-line interface."""
+    if len(sys.argv) > 1:
+        spec_url = sys.argv[1]
+        base_url = sys.argv[2] if len(sys.argv) > 2 else None
+    else:
+        print("Using default test API (simple_test.py)")
+        spec_url = "http://127.0.0.1:8000/openapi.json"
+        base_url = None
+
+    expected = failure_counts(run(spec_url, base_url))
+    print(f"run (async):          {expected}")
+
+    mismatches = 0
+    for workers in (1, 16):
+        counts = failure_counts(run_threaded(spec_url, base_url, workers=workers))
+        print(f"run_threaded ({workers:>2} wk): {counts}")
+        if counts != expected:
+            mismatches += 1
+
+    if mismatches:
+        print("\n❌ run_threaded failure counts differ from run")
+        return 1
+    print("\n✅ run_threaded matches run")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,13 +6,54 @@ This contains the reusable FFTE scanning workflow used by both the CLI and the A
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import hashlib
+import importlib.util
+import json
+import re
+from collections.abc import AsyncIterator, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any
 from urllib.parse import urljoin, urlparse
 
-from surface_discovery.openapi_parser import Endpoint, fetch_and_parse
-from input_generation.edge_cases import generate_edge_cases_flat, generate_sample_object
+import httpx
+
+from surface_discovery._cache import cached_fetch_and_parse
+from surface_discovery.openapi_parser import Endpoint
+from input_generation.edge_cases import (
+    STRING_EDGE_CASES_JSON,
+    compile_sample_builder,
+    generate_edge_cases_flat,
+)
+from execution.async_http_executor import execute_request_async
 from execution.http_executor import execute_request
+from failure_detection.rules import FailureClassification, classify
 from reporting.report import ExecutionLogEntry, generate_report
 
+_PARAM_RE = re.compile(r"\{([^{}]+)\}")
+
+# Request bodies are serialised at planning time and sent as raw bytes
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def make_client(max_connections: int, timeout: float = 10.0) -> httpx.AsyncClient:
+    """
+    Create a pooled AsyncClient for running scans.
+
+    HTTPS targets that negotiate h2 multiplex over few connections; plain
+    HTTP stays on pooled HTTP/1.1, so keep-alive is sized to the pool.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+    )
+    return httpx.AsyncClient(http2=_HTTP2_AVAILABLE, limits=limits, timeout=timeout)
+
 
 def _path_param_value(param_type: str | None) -> str:
     """Return a placeholder value for a path parameter."""
@@ -21,12 +62,14 @@ def _path_param_value(param_type: str | None) -> str:
     return "test"
 
 
-def _build_url(base_url: str, path: str, path_params: dict[str, str]) -> str:
-    """Build full URL with path parameters substituted."""
-    url = path
-    for name, value in path_params.items():
-        url = url.replace("{" + name + "}", value)
-    return urljoin(base_url.rstrip("/") + "/", url.lstrip("/"))
+def _build_url(base_prefix: str, path: str, path_params: dict[str, str]) -> str:
+    """
+    Build full URL with path parameters substituted.
+
+    base_prefix is the base URL with exactly one trailing slash.
+    """
+    url = _PARAM_RE.sub(lambda m: path_params.get(m.group(1), m.group(0)), path)
+    return urljoin(base_prefix, url.lstrip("/"))
 
 
 def _build_params(endpoint: Endpoint) -> tuple[dict[str, str], dict[str, str]]:
@@ -44,77 +87,382 @@ def _build_params(endpoint: Endpoint) -> tuple[dict[str, str], dict[str, str]]:
     return path_params, query_params
 
 
-def run(
+def _distinct_values(values: Sequence[Any], limit: int) -> list[Any]:
+    """
+    Return the first ``limit`` values that serialise differently, in order.
+
+    Keyed on JSON rather than equality, so 0, -0.0 and False stay distinct
+    while repeated enum members or identical sampled objects collapse.
+    """
+    seen: set[str] = set()
+    distinct: list[Any] = []
+    for value in values:
+        key = json.dumps(value, sort_keys=True, default=repr)
+        if key in seen:
+            continue
+        seen.add(key)
+        distinct.append(value)
+        if len(distinct) == limit:
+            break
+    return distinct
+
+
+def _encode_body(body: Any) -> bytes:
+    """
+    Serialise a JSON payload once, in the compact form httpx's json= uses.
+
+    NaN and Infinity are written as bare tokens instead of being rejected:
+    they are deliberate edge cases and should reach the target.
+    """
+    text = json.dumps(body, ensure_ascii=False, separators=(",", ":"))
+    try:
+        return text.encode("utf-8")
+    except UnicodeEncodeError:
+        # Lone surrogates (e.g. from spec enums) cannot be UTF-8; escape them
+        return json.dumps(body, separators=(",", ":")).encode("ascii")
+
+
+# Placeholder set into the sample payload to find where a field's value goes
+_SLOT = "\x00ffte-slot\x00"
+_SLOT_JSON = json.dumps(_SLOT).encode("ascii")
+
+
+def _encode_value(value: Any) -> bytes:
+    """Encode one field value as _encode_body would, reusing edge-case bytes."""
+    if type(value) is str:
+        encoded = STRING_EDGE_CASES_JSON.get(value)
+        if encoded is not None:
+            return encoded
+    return _encode_body(value)
+
+
+def _body_template(build_payload: Any, field: str) -> tuple[bytes, bytes] | None:
+    """
+    Split the encoded payload for ``field`` around the field's value.
+
+    Returns None if the builder does not place values at this path.
+    """
+    parts = _encode_body(build_payload(field, _SLOT)).split(_SLOT_JSON)
+    if len(parts) != 2:
+        return None
+    return parts[0], parts[1]
+
+
+def _build_entries(endpoint: Endpoint, base_prefix: str) -> list[ExecutionLogEntry]:
+    """Build one pending log entry (request only, no result) per test case."""
+    path_params, query_params = _build_params(endpoint)
+
+    # Per-endpoint invariants, computed once rather than per test case
+    url = _build_url(base_prefix, endpoint.path, path_params)
+    params_arg = query_params if query_params else None
+    method = endpoint.method.upper()
+    schema = endpoint.request_body_schema
+
+    entries: list[ExecutionLogEntry] = []
+
+    # FAILURE-FIRST LOGIC
+    if schema:
+        edge_cases = generate_edge_cases_flat(schema)
+
+        # Sample payload built once per endpoint; each case swaps in one field
+        build_payload = compile_sample_builder(schema)
+
+        for field, values in edge_cases.items():
+            values_slice = _distinct_values(values, 3)  # limit explosion
+            # The rest of the payload is encoded once per field; each case
+            # only encodes its own value
+            template = _body_template(build_payload, field)
+            for v in values_slice:
+                json_body = build_payload(field, v)
+                if template is None or v is None:
+                    content = _encode_body(json_body)
+                else:
+                    content = template[0] + _encode_value(v) + template[1]
+
+                entries.append(
+                    ExecutionLogEntry(
+                        method=method,
+                        url=url,
+                        params=params_arg,
+                        json_body=json_body,
+                        content=content,
+                    )
+                )
+    else:
+        # Endpoints without request body
+        entries.append(
+            ExecutionLogEntry(
+                method=method,
+                url=url,
+                params=params_arg,
+                json_body=None,
+            )
+        )
+
+    return entries
+
+
+def _dedupe_entries(entries: list[ExecutionLogEntry]) -> list[ExecutionLogEntry]:
+    """
+    Drop test cases that would send exactly the same request as an earlier one.
+
+    Cases are keyed on a digest of the method, URL, query params and the
+    serialised body, which keeps 0, -0.0, False and null distinct, so only
+    byte-identical requests are merged.
+    """
+    seen: set[bytes] = set()
+    unique: list[ExecutionLogEntry] = []
+    for entry in entries:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(json.dumps([entry.method, entry.url, entry.params], sort_keys=True).encode())
+        digest.update(b"\0" if entry.content is None else b"\1" + entry.content)
+        key = digest.digest()
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(entry)
+    return unique
+
+
+def _plan_entries(
     spec_url: str,
-    base_url: str | None = None,
-    *,
-    timeout: float = 10.0,
-    limit_endpoints: int | None = None,
-) -> dict[str, list[str]]:
-    """Run the full failure-first fuzzing workflow."""
+    base_url: str | None,
+    limit_endpoints: int | None,
+    stats: dict[str, int] | None,
+) -> list[ExecutionLogEntry]:
+    """Fetch the spec and build the deduplicated list of pending test cases."""
     if base_url is None:
         parsed = urlparse(spec_url)
         base_url = f"{parsed.scheme}://{parsed.netloc}"
 
-    endpoints = fetch_and_parse(spec_url)
+    endpoints = cached_fetch_and_parse(spec_url)
     if limit_endpoints is not None:
         endpoints = endpoints[:limit_endpoints]
 
+    base_prefix = base_url.rstrip("/") + "/"
     entries: list[ExecutionLogEntry] = []
-
     for endpoint in endpoints:
-        path_params, query_params = _build_params(endpoint)
-        url = _build_url(base_url, endpoint.path, path_params)
-
-        # FAILURE-FIRST LOGIC
-        if endpoint.request_body_schema:
-            edge_cases = generate_edge_cases_flat(endpoint.request_body_schema)
-
-            for field, values in edge_cases.items():
-                for v in values[:3]:  # limit explosion
-                    try:
-                        json_body = generate_sample_object(
-                            endpoint.request_body_schema,
-                            {field: v},
-                        )
-                    except Exception:
-                        json_body = {}
-
-                    result = execute_request(
-                        method=endpoint.method,
-                        url=url,
-                        timeout=timeout,
-                        params=query_params if query_params else None,
-                        json=json_body,
-                    )
+        entries.extend(_build_entries(endpoint, base_prefix))
 
-                    entries.append(
-                        ExecutionLogEntry(
-                            method=endpoint.method,
-                            url=url,
-                            params=query_params if query_params else None,
-                            json_body=json_body,
-                            result=result,
-                        )
-                    )
-        else:
-            # Endpoints without request body
-            result = execute_request(
-                method=endpoint.method,
-                url=url,
-                timeout=timeout,
-                params=query_params if query_params else None,
-                json=None,
-            )
+    planned = len(entries)
+    entries = _dedupe_entries(entries)
+    if stats is not None:
+        stats["endpoints"] = len(endpoints)
+        stats["tests_executed"] = len(entries)
+        stats["duplicates_skipped"] = planned - len(entries)
+    return entries
+
+
+async def iter_run_async(
+    spec_url: str,
+    base_url: str | None = None,
+    *,
+    timeout: float = 10.0,
+    limit_endpoints: int | None = None,
+    concurrency: int = 20,
+    capture_body: bool = False,
+    stats: dict[str, int] | None = None,
+    client: httpx.AsyncClient | None = None,
+    executor: Executor | None = None,
+) -> AsyncIterator[tuple[ExecutionLogEntry, FailureClassification]]:
+    """
+    Run the fuzzing workflow, yielding each test case as soon as it completes.
+
+    Every test case is independent I/O, so all of them are dispatched over one
+    pooled httpx.AsyncClient with at most ``concurrency`` requests in flight
+    against the target host. Each executed entry is yielded with its
+    classification in completion order, passing or not; nothing is kept once
+    yielded. Response bodies are only read in full when ``capture_body`` is
+    set; classification needs no more than the status, headers and JSON bodies.
+
+    Pass a long-lived ``client`` (see make_client) to share one connection
+    pool across scans; it is left open. Otherwise a client is created for
+    this scan and closed at the end. The blocking spec fetch and case
+    planning run on ``executor``, or the loop's default executor if None.
+
+    If ``stats`` is given it is filled with the number of endpoints scanned,
+    tests executed, duplicate cases skipped and, once the sweep finishes,
+    successful (non-failing) and failing tests.
+    """
+    # Spec fetching uses blocking requests; keep it off the caller's event loop
+    entries = await asyncio.get_running_loop().run_in_executor(
+        executor, _plan_entries, spec_url, base_url, limit_endpoints, stats
+    )
+
+    # Every case targets the same host, so one semaphore caps per-host load;
+    # a client of our own gets a pool sized to match.
+    semaphore = asyncio.Semaphore(concurrency)
+    success_count = 0
+    failure_count = 0
+
+    async with contextlib.AsyncExitStack() as stack:
+        if client is None:
+            client = await stack.enter_async_context(make_client(concurrency, timeout))
 
-            entries.append(
-                ExecutionLogEntry(
-                    method=endpoint.method,
-                    url=url,
-                    params=query_params if query_params else None,
-                    json_body=None,
-                    result=result,
+        async def _execute(entry: ExecutionLogEntry) -> ExecutionLogEntry:
+            async with semaphore:
+                entry.result = await execute_request_async(
+                    client,
+                    method=entry.method,
+                    url=entry.url,
+                    timeout=timeout,
+                    headers=_JSON_HEADERS if entry.content is not None else None,
+                    params=entry.params,
+                    content=entry.content,
+                    capture_body=capture_body,
                 )
-            )
+            entry.classification = classify(entry.result)
+            return entry
+
+        # Finished tasks drop out of the set, so handled entries can be freed
+        tasks = {asyncio.ensure_future(_execute(e)) for e in entries}
+        del entries
+        for task in tasks:
+            task.add_done_callback(tasks.discard)
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                entry = await next_done
+                if entry.classification.is_failure:
+                    failure_count += 1
+                else:
+                    success_count += 1
+                yield entry, entry.classification
+        finally:
+            # The consumer may stop early (e.g. a streaming client disconnects).
+            # Wait for the cancelled requests to unwind so none is still using
+            # the client, or its pooled connection, once this returns.
+            pending = list(tasks)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    if stats is not None:
+        stats["successes"] = success_count
+        stats["failures"] = failure_count
+
+
+async def run_async(
+    spec_url: str,
+    base_url: str | None = None,
+    *,
+    timeout: float = 10.0,
+    limit_endpoints: int | None = None,
+    concurrency: int = 20,
+    capture_body: bool = False,
+    stats: dict[str, int] | None = None,
+    client: httpx.AsyncClient | None = None,
+    executor: Executor | None = None,
+) -> dict[str, list[str]]:
+    """
+    Run the full failure-first fuzzing workflow with concurrent requests.
+
+    Collects iter_run_async into a report. Only failures are kept, so memory
+    grows with the number of failures, not requests. Report entries appear in
+    completion order. ``stats``, ``client`` and ``executor`` are as for
+    iter_run_async.
+    """
+    failures: list[ExecutionLogEntry] = []
+    async for entry, classification in iter_run_async(
+        spec_url,
+        base_url,
+        timeout=timeout,
+        limit_endpoints=limit_endpoints,
+        concurrency=concurrency,
+        capture_body=capture_body,
+        stats=stats,
+        client=client,
+        executor=executor,
+    ):
+        if classification.is_failure:
+            # The report needs only the request and classification
+            entry.result = None
+            failures.append(entry)
+
+    return generate_report(failures)
+
+
+def run(
+    spec_url: str,
+    base_url: str | None = None,
+    *,
+    timeout: float = 10.0,
+    limit_endpoints: int | None = None,
+    concurrency: int = 20,
+    capture_body: bool = False,
+    stats: dict[str, int] | None = None,
+) -> dict[str, list[str]]:
+    """Run the full failure-first fuzzing workflow (blocking wrapper around run_async)."""
+    return asyncio.run(
+        run_async(
+            spec_url,
+            base_url,
+            timeout=timeout,
+            limit_endpoints=limit_endpoints,
+            concurrency=concurrency,
+            capture_body=capture_body,
+            stats=stats,
+        )
+    )
+
+
+def _execute_entry(
+    entry: ExecutionLogEntry,
+    timeout: float,
+    capture_body: bool,
+) -> ExecutionLogEntry:
+    """Execute and classify one test case on the shared requests session."""
+    entry.result = execute_request(
+        method=entry.method,
+        url=entry.url,
+        timeout=timeout,
+        headers=_JSON_HEADERS if entry.content is not None else None,
+        params=entry.params,
+        content=entry.content,
+        capture_body=capture_body,
+    )
+    entry.classification = classify(entry.result)
+    return entry
+
+
+def run_threaded(
+    spec_url: str,
+    base_url: str | None = None,
+    *,
+    timeout: float = 10.0,
+    limit_endpoints: int | None = None,
+    workers: int = 16,
+    capture_body: bool = False,
+    stats: dict[str, int] | None = None,
+) -> dict[str, list[str]]:
+    """
+    Run the fuzzing workflow on a thread pool with the blocking requests executor.
+
+    For callers that cannot use asyncio. requests releases the GIL during
+    network I/O, so ``workers`` threads share the pooled session and keep that
+    many requests in flight. Produces the same report and stats as run_async.
+    """
+    entries = _plan_entries(spec_url, base_url, limit_endpoints, stats)
+
+    failures: list[ExecutionLogEntry] = []
+    success_count = 0
+
+    execute = partial(_execute_entry, timeout=timeout, capture_body=capture_body)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # map submits every case up front; dropping the plan lets handled
+        # entries (and their responses) be freed as results are consumed
+        results = pool.map(execute, entries)
+        del entries
+        for entry in results:
+            if not entry.classification.is_failure:
+                success_count += 1
+                continue
+            # The report needs only the request and classification
+            entry.result = None
+            failures.append(entry)
+
+    if stats is not None:
+        stats["successes"] = success_count
+        stats["failures"] = len(failures)
 
-    return generate_report(entries)
+    return generate_report(failures)
@@ -0,0 +1,154 @@
+"""
+Async HTTP execution module built on a shared httpx.AsyncClient.
+
+Mirrors execute_request but lets many requests run concurrently over one
+connection pool. Returns the same HttpExecutionResult as the sync executor.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import httpx
+
+from execution.http_executor import HttpExecutionResult, _decode_json
+
+# A target may close a kept-alive connection after answering (uvicorn does
+# after a 500) without saying so. The next request on it then fails before
+# the target has seen it. Only that case is retried, and only once: the
+# connection was reused rather than opened for this request, and no
+# response had begun. Failures on fresh connections are reported as-is.
+_STALE_CONNECTION_ERRORS = (
+    httpx.ReadError,
+    httpx.WriteError,
+    httpx.RemoteProtocolError,
+)
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    request: httpx.Request,
+    stream: bool,
+) -> httpx.Response:
+    """Send a request, retrying once on a new connection if a reused one was dead."""
+    events: set[str] = set()
+
+    async def trace(name: str, info: dict[str, Any]) -> None:
+        events.add(name)
+
+    request.extensions["trace"] = trace
+    try:
+        return await client.send(request, stream=stream)
+    except _STALE_CONNECTION_ERRORS:
+        reused = "connection.connect_tcp.started" not in events
+        answered = any(e.endswith("receive_response_headers.complete") for e in events)
+        if not reused or answered:
+            raise
+    del request.extensions["trace"]
+    # Other pooled connections may be dead too, so the retry must not come
+    # from the pool. A one-off client reads the whole body before closing.
+    limits = httpx.Limits(max_keepalive_connections=0)
+    async with httpx.AsyncClient(limits=limits) as fresh:
+        return await fresh.send(request)
+
+
+async def _read_prefix(resp: httpx.Response, max_bytes: int) -> bytes:
+    """Read at most max_bytes of a streamed response body."""
+    chunks: list[bytes] = []
+    size = 0
+    async for chunk in resp.aiter_bytes(8192):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= max_bytes:
+            break
+    return b"".join(chunks)[:max_bytes]
+
+
+async def execute_request_async(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    timeout: float = 10.0,
+    headers: dict[str, str] | None = None,
+    params: dict[str, Any] | None = None,
+    json: Any = None,
+    data: Any = None,
+    content: bytes | None = None,
+    capture_body: bool = True,
+    max_body_bytes: int = 65536,
+) -> HttpExecutionResult:
+    """
+    Execute an HTTP request on an async client and record the result.
+
+    Args:
+        client: Shared httpx.AsyncClient (owns the connection pool).
+        method: HTTP method (GET, POST, PUT, DELETE, etc.).
+        url: Request URL.
+        timeout: Request timeout in seconds. Defaults to 10.0.
+        headers: Optional request headers.
+        params: Optional query parameters.
+        json: Optional JSON body (sets Content-Type automatically).
+        data: Optional form/data body.
+        content: Optional pre-serialised body bytes, sent as-is.
+        capture_body: Read the full response body. When False the response is
+            streamed and non-JSON bodies are cut to max_body_bytes; JSON bodies
+            are still read whole so they can be checked for validity.
+        max_body_bytes: Body size limit used when capture_body is False.
+
+    Returns:
+        HttpExecutionResult with status_code, response_body, latency, and any exception.
+    """
+    result = HttpExecutionResult()
+    start = time.perf_counter()
+
+    try:
+        request = client.build_request(
+            method=method,
+            url=url,
+            timeout=timeout,
+            headers=headers or {},
+            params=params,
+            json=json,
+            data=data,
+            content=content,
+        )
+        resp = await _send(client, request, not capture_body)
+
+        try:
+            elapsed = time.perf_counter() - start
+
+            result.status_code = resp.status_code
+            result.latency_seconds = elapsed
+            result.headers = resp.headers
+            result.content_type = resp.headers.get("Content-Type", "").lower()
+            result.success = True
+
+            if result.content_type.startswith("application/json"):
+                await resp.aread()
+                try:
+                    result.response_body = _decode_json(resp)
+                    result.json_parse_ok = True
+                except ValueError:
+                    result.response_body = resp.text
+                    result.json_parse_ok = False
+            elif capture_body:
+                result.response_body = resp.content if resp.content else resp.text
+            else:
+                result.response_body = await _read_prefix(resp, max_body_bytes)
+        finally:
+            await resp.aclose()
+
+    except httpx.TimeoutException as e:
+        result.latency_seconds = time.perf_counter() - start
+        result.exception = f"Timeout ({timeout}s): {e!s}"
+        result.is_timeout = True
+    except httpx.HTTPError as e:
+        result.latency_seconds = time.perf_counter() - start
+        result.exception = f"{type(e).__name__}: {e!s}"
+    except Exception as e:
+        result.latency_seconds = time.perf_counter() - start
+        result.exception = f"{type(e).__name__}: {e!s}"
+
+    return result
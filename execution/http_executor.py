@@ -6,14 +6,47 @@ Records status code, response body, latency, and exceptions for each request.
 
 from __future__ import annotations
 
+import atexit
+import itertools
 import time
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from typing import Any
 
 import requests
-
-
-@dataclass
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON decoding
+    orjson = None
+
+
+def _drop_after_server_error(resp: requests.Response, *args: Any, **kwargs: Any) -> None:
+    """Keep a connection that answered 5xx out of the pool."""
+    # Servers may close the connection after an unhandled 500 without saying
+    # so (uvicorn does); reused, it would fail the next request before the
+    # target saw it. Detach the socket the way http.client does for
+    # "Connection: close": the response still reads its body, the socket
+    # closes when it is done, and the pool reconnects on next use.
+    conn = resp.raw.connection
+    if resp.status_code >= 500 and conn is not None and conn.sock is not None:
+        sock, conn.sock = conn.sock, None
+        sock.close()
+
+
+# One pooled session for every request, so fuzz cases against the same host
+# reuse TCP/TLS connections instead of opening a new one per call.
+# No retries: a fuzz request that kills the connection is a crash to
+# report, not something to send again.
+_SESSION = requests.Session()
+_SESSION.hooks["response"].append(_drop_after_server_error)
+_SESSION.mount("http://", HTTPAdapter(pool_connections=100, pool_maxsize=100, max_retries=0))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=100, pool_maxsize=100, max_retries=0))
+atexit.register(_SESSION.close)
+
+
+@dataclass(slots=True)
 class HttpExecutionResult:
     """Result of an HTTP request execution."""
 
@@ -21,8 +54,22 @@ class HttpExecutionResult:
     response_body: str | bytes | None = None
     latency_seconds: float | None = None
     exception: str | None = None
-    headers: dict[str, str] = field(default_factory=dict)
+    # The HTTP client's own (case-insensitive) header mapping; copied in to_dict
+    headers: Mapping[str, str] = field(default_factory=dict)
     success: bool = False
+    # Lowercased Content-Type, so checks don't depend on header-name casing
+    content_type: str = ""
+    # Outcome of the executor's JSON decode; None when none was attempted
+    json_parse_ok: bool | None = None
+    # Set by the executor when the request timed out
+    is_timeout: bool = False
+
+    def __post_init__(self) -> None:
+        if not self.content_type and self.headers:
+            self.content_type = next(
+                (v for k, v in self.headers.items() if k.lower() == "content-type"),
+                "",
+            ).lower()
 
     def to_dict(self) -> dict[str, Any]:
         """Convert result to a dictionary for serialization."""
@@ -36,9 +83,26 @@ class HttpExecutionResult:
             "exception": self.exception,
             "headers": dict(self.headers),
             "success": self.success,
+            "json_parse_ok": self.json_parse_ok,
+            "is_timeout": self.is_timeout,
         }
 
 
+def _decode_json(resp: Any) -> Any:
+    """
+    Decode a response's JSON body, using orjson when it is installed.
+
+    Bodies orjson rejects (NaN, a BOM, non-UTF-8 text) fall back to the
+    client's own decoder, so validity is judged exactly as without orjson.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(resp.content)
+        except orjson.JSONDecodeError:
+            pass
+    return resp.json()
+
+
 def execute_request(
     method: str,
     url: str,
@@ -48,6 +112,9 @@ def execute_request(
     params: dict[str, Any] | None = None,
     json: Any = None,
     data: Any = None,
+    content: bytes | None = None,
+    capture_body: bool = True,
+    max_body_bytes: int = 65536,
 ) -> HttpExecutionResult:
     """
     Execute an HTTP request and record the result.
@@ -60,6 +127,11 @@ def execute_request(
         params: Optional query parameters.
         json: Optional JSON body (sets Content-Type automatically).
         data: Optional form/data body.
+        content: Optional pre-serialised body bytes, sent as-is.
+        capture_body: Read the full response body. When False the response is
+            streamed and non-JSON bodies are cut to max_body_bytes; JSON bodies
+            are still read whole so they can be checked for validity.
+        max_body_bytes: Body size limit used when capture_body is False.
 
     Returns:
         HttpExecutionResult with status_code, response_body, latency, and any exception.
@@ -68,35 +140,46 @@ def execute_request(
     start = time.perf_counter()
 
     try:
-        resp = requests.request(
-            method=method.upper(),
+        resp = _SESSION.request(
+            method=method,
             url=url,
             timeout=timeout,
             headers=headers or {},
             params=params,
             json=json,
-            data=data,
+            data=data if content is None else content,
+            stream=not capture_body,
         )
 
-        elapsed = time.perf_counter() - start
-
-        result.status_code = resp.status_code
-        result.latency_seconds = elapsed
-        result.headers = dict(resp.headers)
-        result.success = True
-
-        content_type = resp.headers.get("Content-Type", "")
-        if "application/json" in content_type:
-            try:
-                result.response_body = resp.json()
-            except ValueError:
-                result.response_body = resp.text
-        else:
-            result.response_body = resp.content if resp.content else resp.text
+        try:
+            elapsed = time.perf_counter() - start
+
+            result.status_code = resp.status_code
+            result.latency_seconds = elapsed
+            result.headers = resp.headers
+            result.content_type = resp.headers.get("Content-Type", "").lower()
+            result.success = True
+
+            if result.content_type.startswith("application/json"):
+                try:
+                    result.response_body = _decode_json(resp)
+                    result.json_parse_ok = True
+                except ValueError:
+                    result.response_body = resp.text
+                    result.json_parse_ok = False
+            elif capture_body:
+                result.response_body = resp.content if resp.content else resp.text
+            else:
+                chunks = resp.iter_content(8192)
+                head = itertools.islice(chunks, max_body_bytes // 8192 + 1)
+                result.response_body = b"".join(head)[:max_body_bytes]
+        finally:
+            resp.close()
 
     except requests.Timeout as e:
         result.latency_seconds = time.perf_counter() - start
         result.exception = f"Timeout ({timeout}s): {e!s}"
+        result.is_timeout = True
     except requests.RequestException as e:
         result.latency_seconds = time.perf_counter() - start
         result.exception = f"{type(e).__name__}: {e!s}"
@@ -105,3 +188,8 @@ def execute_request(
         result.exception = f"{type(e).__name__}: {e!s}"
 
     return result
+
+
+def close_session() -> None:
+    """Close the shared session and release its pooled connections."""
+    _SESSION.close()
@@ -11,7 +11,14 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON validation
+    orjson = None
+
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from execution.http_executor import HttpExecutionResult
 
 
@@ -25,7 +32,7 @@ class FailureType(str, Enum):
     CLIENT_ERROR = "client_error"  # 4xx errors
 
 
-@dataclass
+@dataclass(slots=True)
 class FailureClassification:
     """Result of failure classification."""
     failure_type: FailureType
@@ -38,6 +45,24 @@ class FailureClassification:
         return self.failure_type != FailureType.NONE
 
 
+# Shared result for the common no-failure case; treat it as read-only
+_NONE_FLAGS: dict[str, bool] = {
+    "crash": False,
+    "server_error": False,
+    "client_error": False,
+    "timeout": False,
+    "invalid_json": False,
+}
+_NONE = FailureClassification(failure_type=FailureType.NONE, message="", flags=_NONE_FLAGS)
+
+
+def _flags(failed: str) -> dict[str, bool]:
+    """Per-rule flags with only the rule that fired set."""
+    flags = dict(_NONE_FLAGS)
+    flags[failed] = True
+    return flags
+
+
 def classify(result: "HttpExecutionResult") -> FailureClassification:
     """
     Classify an HTTP execution result using rule-based checks.
@@ -48,82 +73,99 @@ def classify(result: "HttpExecutionResult") -> FailureClassification:
     Returns:
         FailureClassification with failure_type, message, and per-rule flags.
     """
-    flags: dict[str, bool] = {
-        "crash": False,
-        "server_error": False,
-        "client_error": False,
-        "timeout": False,
-        "invalid_json": False,
-    }
+    status = result.status_code
+
+    # 0. Fast path: a clean 2xx is by far the most common outcome
+    if not result.exception and status is not None and 200 <= status < 300:
+        if not _expects_json(result) or _is_valid_json_response(result):
+            return _NONE
     
-    # 1. Timeout: exception indicates request timed out
-    if result.exception and _is_timeout_exception(result.exception):
-        flags["timeout"] = True
+    # 1. Timeout: the executor tagged the request as timed out
+    if result.is_timeout:
         return FailureClassification(
             failure_type=FailureType.TIMEOUT,
             message=result.exception or "Request timed out",
-            flags=flags,
+            flags=_flags("timeout"),
         )
     
     # 2. Crash: any exception (connection refused, DNS, SSL, etc.)
     if result.exception:
-        flags["crash"] = True
         return FailureClassification(
             failure_type=FailureType.CRASH,
             message=result.exception,
-            flags=flags,
+            flags=_flags("crash"),
         )
     
     # 3. Server error: 5xx status codes
-    if result.status_code is not None and 500 <= result.status_code < 600:
-        flags["server_error"] = True
+    if status is not None and 500 <= status < 600:
         return FailureClassification(
             failure_type=FailureType.SERVER_ERROR,
-            message=f"HTTP {result.status_code}",
-            flags=flags,
+            message=f"HTTP {status}",
+            flags=_flags("server_error"),
         )
     
     # 4. Client error: 4xx status codes (optional to flag as failure)
-    if result.status_code is not None and 400 <= result.status_code < 500:
-        flags["client_error"] = True
+    if status is not None and 400 <= status < 500:
         return FailureClassification(
             failure_type=FailureType.CLIENT_ERROR,
-            message=f"HTTP {result.status_code}",
-            flags=flags,
+            message=f"HTTP {status}",
+            flags=_flags("client_error"),
         )
     
     # 5. Invalid JSON: Content-Type says JSON but body is not parseable
     if _expects_json(result) and not _is_valid_json_response(result):
-        flags["invalid_json"] = True
         return FailureClassification(
             failure_type=FailureType.INVALID_JSON,
             message="Response claimed JSON but body is not valid JSON",
-            flags=flags,
+            flags=_flags("invalid_json"),
         )
     
-    return FailureClassification(
-        failure_type=FailureType.NONE,
-        message="",
-        flags=flags,
-    )
+    return _NONE
 
 
-def _is_timeout_exception(exception: str) -> bool:
-    """Check if exception message indicates a timeout."""
-    lower = exception.lower()
-    return "timeout" in lower or "timed out" in lower
+def bulk_classify(results: "Iterable[HttpExecutionResult]") -> list[FailureClassification]:
+    """
+    Classify many results at once, e.g. when replaying a large log.
+
+    Gives the same outcome as classify for each result. A result with no
+    exception and a 4xx/5xx status is classified by its status code alone,
+    so those share one classification per code instead of each building
+    its own; treat the returned objects as read-only, like classify's
+    no-failure result.
+    """
+    by_status: dict[int, FailureClassification] = {}
+    classified: list[FailureClassification] = []
+    for result in results:
+        status = result.status_code
+        if (
+            status is not None
+            and 400 <= status < 600
+            and not result.exception
+            and not result.is_timeout
+        ):
+            classification = by_status.get(status)
+            if classification is None:
+                classification = by_status[status] = classify(result)
+        else:
+            classification = classify(result)
+        classified.append(classification)
+    return classified
 
 
 def _expects_json(result: "HttpExecutionResult") -> bool:
     """True if response Content-Type indicates JSON."""
-    ct = result.headers.get("Content-Type", "")
-    return "application/json" in ct
+    return result.content_type.startswith("application/json")
 
 
 def _is_valid_json_response(result: "HttpExecutionResult") -> bool:
     """
     True if response body is valid JSON.
+
+    Uses the executor's recorded parse outcome when there is one, so the
+    body is only parsed here for results built without it.
     """
+    if result.json_parse_ok is not None:
+        return result.json_parse_ok
     body = result.response_body
     if body is None:
         return False
@@ -135,6 +177,12 @@ def _is_valid_json_response(result: "HttpExecutionResult") -> bool:
         except Exception:
             return False
     if isinstance(body, str):
+        if orjson is not None:
+            try:
+                orjson.loads(body)
+                return True
+            except orjson.JSONDecodeError:
+                pass  # stdlib json also accepts NaN/Infinity; let it decide
         try:
             json.loads(body)
             return True
@@ -3,15 +3,28 @@
 FFTE API Service - FIXED v3 with correct test counting.
 """
 
+import asyncio
+import hashlib
+import itertools
 import uuid
 import json
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from typing import Dict, List, Optional, Any
-from datetime import datetime
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from urllib.parse import urlencode
+from datetime import datetime, timezone
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 import threading
 
+try:
+    import orjson
+except ImportError:  # optional: faster NDJSON serialization
+    orjson = None
+
 # ================ Data Models ================
 class ScanRequest(BaseModel):
     spec_url: str | None = None  # URL to OpenAPI JSON
@@ -19,6 +32,7 @@ class ScanRequest(BaseModel):
     base_url: str | None = None
     scan_name: str | None = "Unnamed Scan"
     max_cases_per_field: int = 3
+    concurrency: int = Field(default=20, ge=1, le=100)  # max requests in flight per scan
 
 class ScanStatus(BaseModel):
     """Scan status information."""
@@ -43,32 +57,69 @@ class ScanResult(BaseModel):
     statistics: Dict[str, int]
 
 # ================ Scan Manager ================
+# Distinguishes this process's ETags from those issued before a restart
+_ETAG_EPOCH = uuid.uuid4().hex[:8]
+
 class ScanManager:
-    """Manages all scans in the system."""
+    """
+    Manages all scans in the system.
+
+    ``scans`` is a copy-on-write snapshot: writers build a new dict (and a new
+    entry dict for the scan they change) under ``lock`` and swap it in, so
+    readers just take the current snapshot without locking. Entries are never
+    mutated in place. Each entry keeps its ready-made ScanStatus response under
+    "status_obj", replaced alongside the fields it mirrors, and an "etag" that
+    changes on every write to the entry.
+    """
     
     def __init__(self):
         self.scans: Dict[str, Dict] = {}
-        self.lock = threading.Lock()
+        self.lock = threading.Lock()  # serializes writers only
+        self._versions = itertools.count(1)
     
-    def create_scan(self, request: ScanRequest) -> str:
+    def _next_etag(self) -> str:
+        """New entry ETag; call with the writer lock held."""
+        return f'"{_ETAG_EPOCH}-{next(self._versions)}"'
+    
+    def create_scan(self, request: ScanRequest, target_url: str, endpoints: Optional[List[Dict]] = None) -> str:
         """Create a new scan and return its ID."""
         scan_id = str(uuid.uuid4())
         
+        # Store with unified naming
+        req_dict = request.model_dump()
+        req_dict["target_url"] = target_url
+        
         scan_data = {
             "scan_id": scan_id,
-            "request": request.model_dump(),
+            "request": req_dict,
             "status": "pending",
             "progress": 0.0,
-            "start_time": datetime.now(),
+            "start_time": datetime.now(timezone.utc),
             "end_time": None,
             "tests_executed": 0,
             "failures_found": 0,
+            "endpoints": endpoints or [],
             "results": None,
             "error": None,
         }
+        scan_data["status_obj"] = ScanStatus.model_construct(
+            scan_id=scan_id,
+            status=scan_data["status"],
+            progress=scan_data["progress"],
+            start_time=scan_data["start_time"],
+            end_time=None,
+            target_url=target_url,
+            scan_name=req_dict.get("scan_name") or "UNNAMED_ALPHA",
+            tests_executed=0,
+            failures_found=0,
+            endpoints=scan_data["endpoints"]
+        )
         
         with self.lock:
-            self.scans[scan_id] = scan_data
+            scan_data["etag"] = self._next_etag()
+            scans = dict(self.scans)
+            scans[scan_id] = scan_data
+            self.scans = scans
         
         return scan_id
     
@@ -76,37 +127,90 @@ class ScanManager:
         """Update scan data."""
         with self.lock:
             if scan_id in self.scans:
-                self.scans[scan_id].update(kwargs)
+                scans = dict(self.scans)
+                entry = {**scans[scan_id], **kwargs}
+                status_updates = {k: v for k, v in kwargs.items() if k in ScanStatus.model_fields}
+                if status_updates:
+                    entry["status_obj"] = entry["status_obj"].model_copy(update=status_updates)
+                entry["etag"] = self._next_etag()
+                scans[scan_id] = entry
+                self.scans = scans
     
     def get_scan(self, scan_id: str) -> Optional[Dict]:
         """Get scan data by ID."""
-        with self.lock:
-            return self.scans.get(scan_id)
+        return self.scans.get(scan_id)
     
     def list_scans(self) -> List[Dict]:
         """List all scans."""
-        with self.lock:
-            return list(self.scans.values())
+        return list(self.scans.values())
+    
+    def list_etag(self, scans: List[Dict]) -> str:
+        """ETag for a list_scans() result, derived from its entries' ETags."""
+        digest = hashlib.blake2b(digest_size=8)
+        for scan in scans:
+            digest.update(scan["etag"].encode())
+        return f'"{_ETAG_EPOCH}-{digest.hexdigest()}"'
     
     def delete_scan(self, scan_id: str) -> bool:
         """Delete a scan."""
         with self.lock:
             if scan_id in self.scans:
-                del self.scans[scan_id]
+                scans = dict(self.scans)
+                del scans[scan_id]
+                self.scans = scans
                 return True
         return False
 
 # ================ Real Scanner (uses core.runner) ================
-from core.runner import run as core_run
+from core.runner import iter_run_async as core_iter_run_async
+from core.runner import make_client
+from reporting.report import format_report, generate_report, to_curl
+from surface_discovery._cache import cached_fetch_and_parse
+
+def _payload_text(entry) -> str:
+    """The request body exactly as sent (serialized once by the runner)."""
+    if entry.content is None:
+        return "{}"
+    return entry.content.decode("utf-8")
+
+def _ndjson_line(obj: Dict[str, Any]) -> bytes:
+    """Serialize one NDJSON line, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj) + b"\n"
+        except orjson.JSONEncodeError:  # e.g. lone surrogates from spec strings
+            pass
+    # ASCII escapes encode any str, surrogates included
+    return json.dumps(obj).encode("ascii") + b"\n"
+
+# Scans fuzzing at the same time; extra scans wait in "pending"
+MAX_CONCURRENT_SCANS = 4
+# Connections in the shared scan client: every running scan at the maximum
+# ScanRequest.concurrency (100), so requests never queue for a connection
+SCAN_POOL_SIZE = MAX_CONCURRENT_SCANS * 100
+# Threads for blocking scan work (spec fetch, case planning, report formatting)
+SCAN_EXECUTOR_WORKERS = 8
+# Tests between progress updates; each update is a ScanManager write
+PROGRESS_BATCH = 5
 
 class FFTEScanner:
     """Runs FFTE scans using the actual core runner."""
     
     def __init__(self, scan_manager: ScanManager):
         self.scan_manager = scan_manager
+        self.scan_slots = asyncio.Semaphore(MAX_CONCURRENT_SCANS)
+        # Pooled client and blocking-work executor shared by all scans;
+        # both are opened and closed by the app lifespan
+        self.http_client = None
+        self.executor = None
     
-    def run_scan(self, scan_id: str):
-        """Run a scan in a background thread."""
+    async def run_scan(self, scan_id: str):
+        """Run a scan on the event loop, waiting for a free scan slot first."""
+        async with self.scan_slots:
+            await self._run_scan(scan_id)
+    
+    async def _run_scan(self, scan_id: str):
+        """Run a single scan and store its results."""
         try:
             scan = self.scan_manager.get_scan(scan_id)
             if not scan:
@@ -116,6 +220,7 @@ class FFTEScanner:
             spec_url = request_data.get("target_url") or request_data.get("spec_url")
             base_url = request_data.get("base_url")
             max_cases = request_data.get("max_cases_per_field", 3)
+            concurrency = request_data.get("concurrency", 20)
             
             if not spec_url:
                 raise ValueError("No spec_url or target_url provided")
@@ -128,82 +233,64 @@ class FFTEScanner:
             print(f"   Base URL: {base_url or 'auto-detect'}")
             print(f"   Max cases per field: {max_cases}")
             
-            # Use the actual core runner from core/runner.py
-            report = core_run(
+            # Use the actual core runner from core/runner.py; each result
+            # arrives already classified, so the UI failures list is built
+            # as failures come in rather than parsed back out of curl strings
+            run_stats = {}
+            failed_entries = []
+            failures_list = []
+            done = 0
+            async for entry, classification in core_iter_run_async(
                 spec_url=spec_url,
                 base_url=base_url,
                 timeout=10.0,
-                limit_endpoints=None
-            )
-            
-            # Count statistics
-            from reporting.report import format_report
-            
-            total_failures = sum(len(cmds) for cmds in report.values())
-            formatted = format_report(report)
-            
-            # Convert report to failures list for UI
-            failures_list = []
-            for failure_type, curl_commands in report.items():
-                for cmd in curl_commands:
-                    # Parse curl command to extract method, url, payload
-                    method = "POST" if "-X POST" in cmd else "GET"
-                    url = ""
-                    payload = "{}"
-                    
-                    # Extract URL (between quotes after curl)
-                    import re
-                    url_match = re.search(r'"(https?://[^"]+)"', cmd)
-                    if url_match:
-                        url = url_match.group(1)
-                    
-                    # Extract payload (after -d)
-                    payload_match = re.search(r"-d '([^']+)'", cmd)
-                    if payload_match:
-                        payload = payload_match.group(1)
-                    
+                limit_endpoints=None,
+                concurrency=concurrency,
+                stats=run_stats,
+                client=self.http_client,
+                executor=self.executor
+            ):
+                if classification.is_failure:
+                    # The report needs only the request and classification
+                    entry.result = None
+                    failed_entries.append(entry)
+                    url = entry.url
+                    if entry.params:
+                        url = f"{url}?{urlencode(entry.params, doseq=True)}"
                     failures_list.append({
-                        "method": method,
+                        "method": entry.method,
                         "url": url,
-                        "type": failure_type,
-                        "payload": payload
+                        "type": classification.failure_type.value,
+                        "payload": _payload_text(entry)
                     })
+                # Progress goes out every PROGRESS_BATCH tests, not per test;
+                # the planned total is in run_stats before the first result
+                done += 1
+                if done % PROGRESS_BATCH == 0:
+                    self.scan_manager.update_scan(
+                        scan_id,
+                        progress=10.0 + 80.0 * done / run_stats["tests_executed"],
+                        tests_executed=done,
+                        failures_found=len(failed_entries)
+                    )
             
-            # ===== FIX: Calculate actual total tests executed =====
-            from surface_discovery.openapi_parser import fetch_and_parse
-            from input_generation.edge_cases import generate_edge_cases_flat
-            
-            total_tests_executed = 0
-            endpoint_count = 0
+            # Count statistics
+            report = generate_report(failed_entries)
+            total_failures = len(failed_entries)
+            formatted = await asyncio.get_running_loop().run_in_executor(
+                self.executor, format_report, report
+            )
             
-            try:
-                endpoints = fetch_and_parse(spec_url)
-                endpoint_count = len(endpoints)
-                
-                # Calculate actual tests executed (same logic as core.runner)
-                for endpoint in endpoints:
-                    if endpoint.request_body_schema:
-                        edge_cases = generate_edge_cases_flat(endpoint.request_body_schema)
-                        # Each field is tested with up to 3 values (matching core.runner[:3])
-                        for field, values in edge_cases.items():
-                            total_tests_executed += min(len(values), 3)
-                    else:
-                        # Endpoints without request body get 1 test
-                        total_tests_executed += 1
-                
-                print(f"📊 Tests executed: {total_tests_executed}, Failures: {total_failures}")
-                
-            except Exception as e:
-                print(f"⚠️  Could not calculate exact test count: {e}")
-                # Fallback: reasonable estimate
-                total_tests_executed = max(total_failures * 3, total_failures + 20)
+            total_tests_executed = run_stats["tests_executed"]
+            endpoint_count = run_stats["endpoints"]
+            print(f"📊 Tests executed: {total_tests_executed}, Failures: {total_failures}")
             
             # Update with results
             self.scan_manager.update_scan(
                 scan_id,
                 status="completed",
                 progress=100.0,
-                end_time=datetime.now(),
+                end_time=datetime.now(timezone.utc),
                 tests_executed=total_tests_executed,
                 failures_found=total_failures,
                 results={
@@ -213,7 +300,8 @@ class FFTEScanner:
                     "statistics": {
                         "total_tests": total_tests_executed,
                         "failures": total_failures,
-                        "endpoints": endpoint_count
+                        "endpoints": endpoint_count,
+                        "duplicates_skipped": run_stats["duplicates_skipped"]
                     }
                 }
             )
@@ -221,21 +309,40 @@ class FFTEScanner:
             print(f"✅ Scan completed: {total_failures} failures found out of {total_tests_executed} tests")
             
         except Exception as e:
-            import traceback
             traceback.print_exc()
             self.scan_manager.update_scan(
                 scan_id,
                 status="failed",
                 error=str(e),
                 progress=100.0,
-                end_time=datetime.now()
+                end_time=datetime.now(timezone.utc)
             )
 
 # ================ FastAPI App ================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the resources scans share for the app's lifetime: one pooled HTTP
+    client, so scans reuse connections, and a dedicated thread pool, so
+    blocking scan work does not compete with request handling.
+    """
+    scanner.http_client = make_client(SCAN_POOL_SIZE)
+    scanner.executor = ThreadPoolExecutor(
+        max_workers=SCAN_EXECUTOR_WORKERS, thread_name_prefix="ffte-scan"
+    )
+    try:
+        yield
+    finally:
+        scanner.executor.shutdown(wait=False, cancel_futures=True)
+        scanner.executor = None
+        await scanner.http_client.aclose()
+        scanner.http_client = None
+
 app = FastAPI(
     title="FFTE API",
     description="Failure-First Testing Engine - REST API (FIXED v3.0)",
-    version="3.0.0"
+    version="3.0.0",
+    lifespan=lifespan
 )
 
 # Initialize components
@@ -252,6 +359,14 @@ app.add_middleware(
 )
 
 # ================ API Endpoints ================
+def _not_modified(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match already names this ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return etag in tags or "*" in tags
+
 @app.post("/api/scan/start")
 async def start_scan(request: ScanRequest, background_tasks: BackgroundTasks):
     # Ensure one of the URLs is present
@@ -259,84 +374,121 @@ async def start_scan(request: ScanRequest, background_tasks: BackgroundTasks):
     if not url:
         raise HTTPException(status_code=422, detail="spec_url or target_url required")
     
-    # Store with unified naming
-    req_dict = request.model_dump()
-    req_dict["target_url"] = url 
-    
-    scan_id = str(uuid.uuid4())
-    
-    # Get endpoint info for UI preview (non-blocking)
+    # Get endpoint info for UI preview; the spec fetch blocks, so keep it off the event loop
     try:
-        from surface_discovery.openapi_parser import fetch_and_parse
-        endpoints = fetch_and_parse(url)
+        endpoints = await asyncio.get_running_loop().run_in_executor(
+            scanner.executor, cached_fetch_and_parse, url
+        )
         endpoint_previews = [{"method": e.method.upper(), "path": e.path} for e in endpoints[:10]]
     except:
         endpoint_previews = []
     
-    scan_data = {
-        "scan_id": scan_id,
-        "request": req_dict,
-        "status": "pending",
-        "progress": 0.0,
-        "start_time": datetime.now(),
-        "end_time": None,
-        "tests_executed": 0,
-        "failures_found": 0,
-        "endpoints": endpoint_previews,
-        "results": None,
-        "error": None,
-    }
-    
-    with scan_manager.lock:
-        scan_manager.scans[scan_id] = scan_data
+    scan_id = scan_manager.create_scan(request, url, endpoint_previews)
     
     # Run scan in background
     background_tasks.add_task(scanner.run_scan, scan_id)
     
     return {"scan_id": scan_id, "status": "started"}
 
-@app.get("/api/scan/{scan_id}", response_model=ScanStatus)
-async def get_scan_status(scan_id: str):
+async def _stream_scan_results(request: ScanRequest, spec_url: str):
+    """Run a scan and yield one NDJSON line per executed test, then the statistics."""
+    run_stats = {}
+    failures = 0
+    try:
+        async with scanner.scan_slots:
+            async for entry, classification in core_iter_run_async(
+                spec_url=spec_url,
+                base_url=request.base_url,
+                timeout=10.0,
+                concurrency=request.concurrency,
+                stats=run_stats,
+                client=scanner.http_client,
+                executor=scanner.executor
+            ):
+                line = {
+                    "method": entry.method,
+                    "url": entry.url,
+                    "type": classification.failure_type.value,
+                    "message": classification.message,
+                    "status_code": entry.result.status_code,
+                    "payload": _payload_text(entry),
+                }
+                if classification.is_failure:
+                    failures += 1
+                    line["curl"] = to_curl(entry)
+                yield _ndjson_line(line)
+    except Exception as e:
+        # The 200 status is already sent; end the stream with the error instead
+        traceback.print_exc()
+        yield _ndjson_line({"error": str(e)})
+        return
+    
+    yield _ndjson_line({"statistics": {
+        "total_tests": run_stats["tests_executed"],
+        "failures": failures,
+        "endpoints": run_stats["endpoints"],
+        "duplicates_skipped": run_stats["duplicates_skipped"]
+    }})
+
+@app.post("/api/scan/stream")
+async def stream_scan(request: ScanRequest):
+    """
+    Run a scan and stream each test result as NDJSON while it runs.
+    """
+    url = request.spec_url or request.target_url
+    if not url:
+        raise HTTPException(status_code=422, detail="spec_url or target_url required")
+    
+    # Fail before the 200 goes out; the scan itself reuses the cached parse
+    try:
+        await asyncio.get_running_loop().run_in_executor(
+            scanner.executor, cached_fetch_and_parse, url
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        _stream_scan_results(request, url),
+        media_type="application/x-ndjson"
+    )
+
+@app.get("/api/scan/{scan_id}", responses={200: {"model": ScanStatus}})
+async def get_scan_status(scan_id: str, request: Request, response: Response):
     """
     Get status and progress of a scan.
+
+    Supports conditional GET: unchanged polls get 304 Not Modified, and a
+    finished scan (which no longer changes) may be cached outright.
     """
     scan = scan_manager.get_scan(scan_id)
     if not scan:
         raise HTTPException(status_code=404, detail=f"Scan {scan_id} not found")
     
-    return ScanStatus(
-        scan_id=scan_id,
-        status=scan["status"],
-        progress=scan["progress"],
-        start_time=scan["start_time"],
-        end_time=scan.get("end_time"),
-        target_url=scan["request"]["target_url"],
-        scan_name=scan["request"].get("scan_name") or "UNNAMED_ALPHA",
-        tests_executed=scan.get("tests_executed", 0),
-        failures_found=scan.get("failures_found", 0),
-        endpoints=scan.get("endpoints", [])
-    )
+    finished = scan["status"] in ("completed", "failed")
+    headers = {
+        "ETag": scan["etag"],
+        "Cache-Control": "max-age=3600, immutable" if finished else "no-cache"
+    }
+    if _not_modified(request, scan["etag"]):
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return scan["status_obj"]
 
-@app.get("/api/scans", response_model=List[ScanStatus])
-async def list_scans():
+@app.get("/api/scans", responses={200: {"model": List[ScanStatus]}})
+async def list_scans(request: Request, response: Response):
     """
     List all scans (completed, running, and pending).
+
+    Supports conditional GET: 304 Not Modified while no scan has changed.
     """
     scans = scan_manager.list_scans()
-    return [
-        ScanStatus(
-            scan_id=scan["scan_id"],
-            status=scan["status"],
-            progress=scan["progress"],
-            start_time=scan["start_time"],
-            end_time=scan.get("end_time"),
-            target_url=scan["request"]["target_url"],
-            scan_name=scan["request"].get("scan_name"),
-            tests_executed=scan.get("tests_executed", 0),
-            failures_found=scan.get("failures_found", 0)
-        )
-        for scan in scans
-    ]
+    headers = {"ETag": scan_manager.list_etag(scans), "Cache-Control": "no-cache"}
+    if _not_modified(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return [scan["status_obj"] for scan in scans]
 
 @app.delete("/api/scan/{scan_id}", response_model=Dict[str, str])
 async def delete_scan(scan_id: str):
@@ -348,7 +500,7 @@ async def delete_scan(scan_id: str):
     else:
         raise HTTPException(status_code=404, detail=f"Scan {scan_id} not found")
 
-@app.get("/api/scan/{scan_id}/results", response_model=ScanResult)
+@app.get("/api/scan/{scan_id}/results", responses={200: {"model": ScanResult}})
 async def get_scan_results(scan_id: str):
     """
     Get detailed results of a completed scan.
@@ -367,7 +519,7 @@ async def get_scan_results(scan_id: str):
         raise HTTPException(status_code=404, detail=f"No results found for scan {scan_id}")
     
     results = scan["results"]
-    return ScanResult(
+    return ScanResult.model_construct(
         scan_id=scan_id,
         status=scan["status"],
         failures=results.get("failures", []),
@@ -376,16 +528,21 @@ async def get_scan_results(scan_id: str):
         statistics=results["statistics"]
     )
 
+# Health fields that never change; each response adds the time and scan count
+_HEALTH_INFO = {
+    "status": "healthy",
+    "service": "ffte-api-fixed-v3",
+    "version": "3.0.0"
+}
+
 @app.get("/api/health")
 async def health_check():
     """
     Health check endpoint.
     """
     return {
-        "status": "healthy",
-        "service": "ffte-api-fixed-v3",
-        "version": "3.0.0",
-        "timestamp": datetime.now().isoformat(),
+        **_HEALTH_INFO,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "scans_count": len(scan_manager.scans)
     }
 
@@ -396,8 +553,12 @@ if __name__ == "__main__":
     print("📚 API Documentation: http://localhost:8001/docs")
     print("🔗 Available endpoints:")
     print("   POST   /api/scan/start     - Start new scan")
+    print("   POST   /api/scan/stream    - Run scan, stream results (NDJSON)")
     print("   GET    /api/scan/{id}      - Get scan status")
     print("   GET    /api/scans          - List all scans")
     print("   DELETE /api/scan/{id}      - Delete scan")
     print("   GET    /api/health         - Health check")
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    # uvicorn uses uvloop and httptools when installed (uvicorn[standard]).
+    # One worker only: scans live in this process's ScanManager, so other
+    # workers would not see them.
+    uvicorn.run(app, host="0.0.0.0", port=8001, loop="auto", http="auto", workers=1)
\ No newline at end of file
@@ -7,12 +7,16 @@ or input generation from JSON Schema definitions.
 
 from __future__ import annotations
 
+import json
 import math
+import re
+from collections.abc import Callable, Sequence
 from typing import Any
 
 # --- Edge-case values per JSON Schema type ---
+# Tuples: candidates are handed out without copying, so they must stay immutable.
 
-NUMBER_EDGE_CASES: list[float] = [
+NUMBER_EDGE_CASES: tuple[float, ...] = (
     0,
     -0.0,
     1,
@@ -26,9 +30,9 @@ NUMBER_EDGE_CASES: list[float] = [
     -1e10,
     1e-10,
     -1e-10,
-]
+)
 
-INTEGER_EDGE_CASES: list[int] = [
+INTEGER_EDGE_CASES: tuple[int, ...] = (
     0,
     1,
     -1,
@@ -36,9 +40,9 @@ INTEGER_EDGE_CASES: list[int] = [
     -(2**31),
     2**63 - 1,
     -(2**63),
-]
+)
 
-STRING_EDGE_CASES: list[str] = [
+STRING_EDGE_CASES: tuple[str, ...] = (
     "",
     " ",
     "a",
@@ -59,30 +63,38 @@ STRING_EDGE_CASES: list[str] = [
     "null",
     "true",
     "false",
-]
+)
 
-BOOLEAN_EDGE_CASES: list[bool] = [True, False]
+# JSON encodings of the string edge cases, made once at import so request
+# bodies can splice them in instead of re-encoding them per test case
+STRING_EDGE_CASES_JSON: dict[str, bytes] = {
+    s: json.dumps(s, ensure_ascii=False).encode("utf-8") for s in STRING_EDGE_CASES
+}
 
-ARRAY_EDGE_CASES: list[list[Any]] = [
+BOOLEAN_EDGE_CASES: tuple[bool, ...] = (True, False)
+
+ARRAY_EDGE_CASES: tuple[list[Any], ...] = (
     [],
     [None],
     [0],
     [""],
     [True],
-]
+)
 
-OBJECT_EDGE_CASES: list[dict[str, Any]] = [
+OBJECT_EDGE_CASES: tuple[dict[str, Any], ...] = (
     {},
     {"key": None},
     {"key": ""},
     {"key": 0},
-]
+)
+
+_ANY_EDGE_CASES: tuple[Any, ...] = (None, 0, 1, "", " ", True, False, [], {})
 
 
 def _get_candidates_for_type(
     schema: dict[str, Any],
     fallback_type: str | None = None,
-) -> list[Any]:
+) -> Sequence[Any]:
     """
     Return candidate values for a schema based on its type and constraints.
 
@@ -91,7 +103,8 @@ def _get_candidates_for_type(
         fallback_type: Type to use when schema has no explicit type.
 
     Returns:
-        List of candidate values for edge-case testing.
+        Candidate values for edge-case testing. Shared constants are returned
+        as-is when no constraint applies, so treat the result as read-only.
     """
     raw_type = schema.get("type", fallback_type)
     if isinstance(raw_type, list):
@@ -109,13 +122,15 @@ def _get_candidates_for_type(
     if "enum" in schema:
         return list(schema["enum"])
 
-    def _add_null(candidates: list[Any]) -> list[Any]:
+    def _add_null(candidates: Sequence[Any]) -> Sequence[Any]:
         if nullable and None not in candidates:
-            return [None] + candidates
+            return [None, *candidates]
         return candidates
 
+    candidates: Sequence[Any]
+
     if schema_type == "number":
-        candidates = list(NUMBER_EDGE_CASES)
+        candidates = NUMBER_EDGE_CASES
         if "minimum" in schema or "maximum" in schema:
             mn = schema.get("minimum", -math.inf)
             mx = schema.get("maximum", math.inf)
@@ -123,7 +138,7 @@ def _get_candidates_for_type(
         return _add_null(candidates)
 
     if schema_type == "integer":
-        candidates = list(INTEGER_EDGE_CASES)
+        candidates = INTEGER_EDGE_CASES
         if "minimum" in schema or "maximum" in schema:
             mn = schema.get("minimum", -(2**63))
             mx = schema.get("maximum", 2**63 - 1)
@@ -131,24 +146,25 @@ def _get_candidates_for_type(
         return _add_null(candidates)
 
     if schema_type == "string":
-        candidates = list(STRING_EDGE_CASES)
+        extra: list[str] = []
         fmt = schema.get("format", "")
         if fmt == "email":
-            candidates.extend(["a@b.com", "invalid", "a@", "@b.com"])
+            extra.extend(["a@b.com", "invalid", "a@", "@b.com"])
         elif fmt == "uuid":
-            candidates.extend(["00000000-0000-0000-0000-000000000000", "invalid"])
+            extra.extend(["00000000-0000-0000-0000-000000000000", "invalid"])
         elif fmt == "date-time":
-            candidates.extend(["2024-01-01T00:00:00Z", "invalid"])
+            extra.extend(["2024-01-01T00:00:00Z", "invalid"])
         elif fmt == "date":
-            candidates.extend(["2024-01-01", "invalid"])
+            extra.extend(["2024-01-01", "invalid"])
         if "minLength" in schema:
-            candidates.append("x" * schema["minLength"])
+            extra.append("x" * schema["minLength"])
         if "maxLength" in schema:
-            candidates.append("x" * min(schema["maxLength"], 1000))
+            extra.append("x" * min(schema["maxLength"], 1000))
+        candidates = [*STRING_EDGE_CASES, *extra] if extra else STRING_EDGE_CASES
         return _add_null(candidates)
 
     if schema_type == "boolean":
-        return _add_null(list(BOOLEAN_EDGE_CASES))
+        return _add_null(BOOLEAN_EDGE_CASES)
 
     if schema_type == "array":
         items_schema = schema.get("items", {})
@@ -158,35 +174,35 @@ def _get_candidates_for_type(
             for c in item_candidates[:5]:  # limit combinations
                 candidates.append([c])
         else:
-            candidates = list(ARRAY_EDGE_CASES)
+            candidates = ARRAY_EDGE_CASES
         if "minItems" in schema:
             n = schema["minItems"]
-            candidates.append([None] * n)
+            candidates = [*candidates, [None] * n]
         return _add_null(candidates)
 
     if schema_type == "object":
         props = schema.get("properties", {})
         if props:
-            obj_candidates = []
-            for _ in range(3):  # few sampled objects
-                obj = {}
-                for key, prop_schema in list(props.items())[:5]:
-                    cs = _get_candidates_for_type(prop_schema)
-                    if cs:
-                        obj[key] = cs[0]
-                obj_candidates.append(obj)
-            candidates = list(OBJECT_EDGE_CASES) + obj_candidates
+            # Each property's candidates are computed once, not per sample
+            sample = {}
+            for key, prop_schema in list(props.items())[:5]:
+                cs = _get_candidates_for_type(prop_schema)
+                if cs:
+                    sample[key] = cs[0]
+            obj_candidates = [dict(sample) for _ in range(3)]  # few sampled objects
+            candidates = [*OBJECT_EDGE_CASES, *obj_candidates]
         else:
-            candidates = list(OBJECT_EDGE_CASES)
+            candidates = OBJECT_EDGE_CASES
         return _add_null(candidates)
 
     # Unknown or any type
-    return _add_null(
-        [None, 0, 1, "", " ", True, False, [], {}]
-    )
+    return _add_null(_ANY_EDGE_CASES)
 
 
-def generate_edge_cases(schema: dict[str, Any]) -> dict[str, list[Any]]:
+_PATH_BOUNDARY_RE = re.compile(r"\.|\[\]")
+
+
+def generate_edge_cases(schema: dict[str, Any]) -> dict[str, Sequence[Any]]:
     """
     Generate edge-case candidate values per field from a JSON Schema.
 
@@ -199,7 +215,17 @@ def generate_edge_cases(schema: dict[str, Any]) -> dict[str, list[Any]]:
     Returns:
         Dict mapping each field path (e.g. "items.id") to a list of candidate values.
     """
-    result: dict[str, list[Any]] = {}
+    result: dict[str, Sequence[Any]] = {}
+    # Candidates keyed by schema identity for this call: a schema dict
+    # reached from several fields is classified once. Serialising each node
+    # for a key would re-walk every subtree at every level of nesting.
+    memo: dict[int, Sequence[Any]] = {}
+
+    def _candidates(s: dict[str, Any]) -> Sequence[Any]:
+        key = id(s)
+        if key not in memo:
+            memo[key] = _get_candidates_for_type(s)
+        return memo[key]
 
     def _walk(s: dict[str, Any], path: str = "") -> None:
         schema_type = s.get("type")
@@ -209,34 +235,37 @@ def generate_edge_cases(schema: dict[str, Any]) -> dict[str, list[Any]]:
 
         if schema_type == "object":
             obj_path = path or "value"
-            result[obj_path] = _get_candidates_for_type(s)
+            result[obj_path] = _candidates(s)
             props = s.get("properties", {})
             for key, prop_schema in props.items():
                 field_path = f"{path}.{key}" if path else key
                 if isinstance(prop_schema, dict):
-                    result[field_path] = _get_candidates_for_type(prop_schema)
+                    # Typed schemas record their own path first thing in _walk
                     _walk(prop_schema, field_path)
+                    if field_path not in result:
+                        result[field_path] = _candidates(prop_schema)
                 else:
                     result[field_path] = [None, 0, "", True, False, [], {}]
 
         elif schema_type == "array":
             array_path = path or "value"
-            result[array_path] = _get_candidates_for_type(s)
+            result[array_path] = _candidates(s)
             items = s.get("items", {})
             if isinstance(items, dict):
                 item_path = f"{path}[]" if path else "[]"
-                result[item_path] = _get_candidates_for_type(items)
                 _walk(items, item_path)
+                if item_path not in result:
+                    result[item_path] = _candidates(items)
 
         elif schema_type is not None:
             field_path = path or "value"
-            result[field_path] = _get_candidates_for_type(s)
+            result[field_path] = _candidates(s)
 
     _walk(schema)
     return result
 
 
-def generate_edge_cases_flat(schema: dict[str, Any]) -> dict[str, list[Any]]:
+def generate_edge_cases_flat(schema: dict[str, Any]) -> dict[str, Sequence[Any]]:
     """
     Generate edge-case values per leaf field only (no nested paths).
 
@@ -244,13 +273,13 @@ def generate_edge_cases_flat(schema: dict[str, Any]) -> dict[str, list[Any]]:
     to their candidate values.
     """
     all_cases = generate_edge_cases(schema)
-    # Keep leaf paths: those whose path is not a prefix of another
-    paths = sorted(all_cases.keys())
-    leaf_paths = [
-        p for i, p in enumerate(paths)
-        if not any(p2.startswith(p + ".") or p2.startswith(p + "[]") for p2 in paths[i + 1:])
-    ]
-    return {p: all_cases[p] for p in leaf_paths}
+    # Keep leaf paths: those no other path extends with "." or "[]". Each
+    # path marks its own parents, so this is linear in total path length.
+    parents: set[str] = set()
+    for p in all_cases:
+        for m in _PATH_BOUNDARY_RE.finditer(p):
+            parents.add(p[:m.start()])
+    return {p: all_cases[p] for p in sorted(all_cases) if p not in parents}
 
 
 def generate_sample_object(
@@ -279,9 +308,47 @@ def generate_sample_object(
     return obj
 
 
+def compile_sample_builder(
+    schema: dict[str, Any],
+) -> Callable[[str, Any], dict[str, Any]]:
+    """
+    Build payloads for one schema with a single field overridden.
+
+    The sample object is generated once and each field path is split once;
+    the returned build(path, value) gives a fresh copy of the sample with the
+    field at path replaced by value. As in generate_sample_object, array
+    paths and None values are not applied. If the schema cannot be sampled,
+    build always returns {}.
+    """
+    try:
+        sample = generate_sample_object(schema)
+    except Exception:
+        return lambda path, value: {}
+
+    # path -> keys to set, or None for paths that are never applied
+    keys_by_path: dict[str, list[str] | None] = {}
+
+    def build(path: str, value: Any) -> dict[str, Any]:
+        obj = dict(sample)
+        if value is None:
+            return obj
+        if path in keys_by_path:
+            keys = keys_by_path[path]
+        else:
+            keys = None if "[]" in path or not path else path.split(".")
+            keys_by_path[path] = keys
+        if keys is not None:
+            _set_nested(obj, keys, value)
+        return obj
+
+    return build
+
+
 def _set_nested(obj: dict[str, Any], path: list[str], value: Any) -> None:
     for key in path[:-1]:
-        if key not in obj:
-            obj[key] = {}
-        obj = obj[key]
+        child = obj.get(key)
+        # Copy on descent: the existing value may be a shared edge-case candidate
+        child = dict(child) if isinstance(child, dict) else {}
+        obj[key] = child
+        obj = child
     obj[path[-1]] = value
@@ -5,15 +5,22 @@ Report module: group execution failures by type and generate reproducible curl c
 from __future__ import annotations
 
 import json
-from collections import defaultdict
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator, Mapping
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, BinaryIO, TextIO
+from urllib.parse import quote_plus, urlencode
 
-from failure_detection.rules import FailureType, classify
+from failure_detection.rules import FailureClassification, FailureType, bulk_classify, classify
 from execution.http_executor import HttpExecutionResult
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON-lines reports
+    orjson = None
 
-@dataclass
+
+@dataclass(slots=True)
 class ExecutionLogEntry:
     """
     A single execution log entry: request details + result.
@@ -27,24 +34,37 @@ class ExecutionLogEntry:
     params: dict[str, Any] | None = None
     json_body: Any = None
     data: Any = None
+    # json_body pre-serialised by the runner; what is actually sent when set
+    content: bytes | None = None
     result: HttpExecutionResult | dict[str, Any] | None = None
+    # Set by the runner when it classifies the result inline
+    classification: FailureClassification | None = None
 
     def _get_result(self) -> HttpExecutionResult | None:
-        """Return HttpExecutionResult for classification."""
+        """
+        Return HttpExecutionResult for classification.
+
+        A dict result is converted once and stored back on the entry.
+        """
         if self.result is None:
             return None
         if isinstance(self.result, HttpExecutionResult):
             return self.result
-        # Build from dict (e.g. from JSON logs)
+        # Build from dict (e.g. from JSON logs). Positional, in field order:
+        # cheaper than keywords when replaying large logs.
         d = self.result
-        return HttpExecutionResult(
-            status_code=d.get("status_code"),
-            response_body=d.get("response_body"),
-            latency_seconds=d.get("latency_seconds"),
-            exception=d.get("exception"),
-            headers=d.get("headers") or {},
-            success=d.get("success", False),
+        self.result = HttpExecutionResult(
+            d.get("status_code"),
+            d.get("response_body"),
+            d.get("latency_seconds"),
+            d.get("exception"),
+            d.get("headers") or {},
+            d.get("success", False),
+            "",  # content_type, derived from headers in __post_init__
+            d.get("json_parse_ok"),
+            d.get("is_timeout", False),
         )
+        return self.result
 
     @classmethod
     def from_dict(cls, d: dict[str, Any]) -> ExecutionLogEntry:
@@ -60,9 +80,16 @@ class ExecutionLogEntry:
         )
 
 
+def _classify_missing(entries: list[ExecutionLogEntry]) -> None:
+    """Classify, as one batch, every entry with a result but no cached classification."""
+    pending = [e for e in entries if e.classification is None and e._get_result() is not None]
+    for entry, classification in zip(pending, bulk_classify([e.result for e in pending])):
+        entry.classification = classification
+
+
 def group_failures_by_type(
     entries: list[ExecutionLogEntry],
-) -> dict[FailureType, list[ExecutionLogEntry]]:
+) -> Mapping[FailureType, list[ExecutionLogEntry]]:
     """
     Group execution log entries by failure type.
 
@@ -71,17 +98,67 @@ def group_failures_by_type(
 
     Returns:
         Dict mapping FailureType to list of entries that failed with that type.
-        Entries with FailureType.NONE are excluded.
+        Entries with FailureType.NONE are excluded. A classification already
+        cached on the entry is reused instead of classifying again, and new
+        ones are cached there for later passes.
     """
+    _classify_missing(entries)
     grouped: dict[FailureType, list[ExecutionLogEntry]] = defaultdict(list)
     for entry in entries:
-        result = entry._get_result()
-        if result is None:
-            continue
-        classification = classify(result)
-        if classification.is_failure:
+        classification = entry.classification
+        if classification is not None and classification.is_failure:
             grouped[classification.failure_type].append(entry)
-    return dict(grouped)
+    return grouped
+
+
+def count_failures_by_type(
+    entries: list[ExecutionLogEntry],
+) -> Counter[FailureType]:
+    """
+    Count execution log entries by failure type.
+
+    The counting counterpart of group_failures_by_type, for callers that
+    need only the numbers: no per-type entry lists are built. Classifications
+    are reused and cached on the entries the same way.
+
+    Args:
+        entries: List of ExecutionLogEntry with request and result.
+
+    Returns:
+        Counter mapping FailureType to number of failing entries; entries
+        with FailureType.NONE are not counted.
+    """
+    _classify_missing(entries)
+    counts: Counter[FailureType] = Counter()
+    for entry in entries:
+        classification = entry.classification
+        if classification is not None and classification.is_failure:
+            counts[classification.failure_type] += 1
+    return counts
+
+
+def _escape_double_quoted(value: str) -> str:
+    """Escape a value for use inside a double-quoted shell string."""
+    # Most values need no escaping; one C-level scan each settles that
+    if '"' not in value and "\\" not in value:
+        return value
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _escape_single_quoted(value: str) -> str:
+    """Escape a value for use inside a single-quoted shell string."""
+    if "'" not in value:
+        return value
+    return value.replace("'", "'\\''")
+
+
+def _query_string(params: dict[str, Any]) -> str:
+    """urlencode(params, doseq=True), skipping its general loop for one str pair."""
+    if len(params) == 1:
+        ((key, value),) = params.items()
+        if type(key) is str and type(value) is str:
+            return f"{quote_plus(key)}={quote_plus(value)}"
+    return urlencode(params, doseq=True)
 
 
 def to_curl(entry: ExecutionLogEntry) -> str:
@@ -94,42 +171,41 @@ def to_curl(entry: ExecutionLogEntry) -> str:
     Returns:
         A curl command string that can be run in a shell.
     """
-    parts: list[str] = ["curl"]
-    parts.append("-X")
-    parts.append(entry.method.upper())
+    headers = entry.headers or {}
+    parts: list[str] = [f"curl -X {entry.method.upper()}"]
 
     # Headers
-    for key, value in (entry.headers or {}).items():
-        # Escape double quotes in value for shell
-        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
-        parts.append(f'-H "{key}: {escaped}"')
+    for key, value in headers.items():
+        parts.append(f'-H "{key}: {_escape_double_quoted(str(value))}"')
 
     # URL with query params
     url = entry.url
     params = entry.params or {}
     if params:
-        from urllib.parse import urlencode
-
-        qs = urlencode(params, doseq=True)
+        qs = _query_string(params)
         sep = "&" if "?" in url else "?"
         url = f"{url}{sep}{qs}"
     parts.append(f'"{url}"')
 
     # Body
     if entry.json_body is not None:
-        body_str = json.dumps(entry.json_body, ensure_ascii=False)
+        # Reuse the runner's encoded body: no re-encoding, and the curl
+        # sends exactly the bytes the test did
+        if entry.content is not None:
+            body_str = entry.content.decode("utf-8")
+        else:
+            body_str = json.dumps(entry.json_body, ensure_ascii=False)
         # For curl -d, we use single quotes and escape single quotes
-        escaped = body_str.replace("'", "'\\''")
-        parts.append(f"-d '{escaped}'")
-        if "content-type" not in {k.lower() for k in (entry.headers or {}).keys()}:
-            parts.append("-H \"Content-Type: application/json\"")
+        body_arg = f"-d '{_escape_single_quoted(body_str)}'"
+        if not any(k.lower() == "content-type" for k in headers):
+            body_arg += ' -H "Content-Type: application/json"'
+        parts.append(body_arg)
     elif entry.data is not None:
         if isinstance(entry.data, (dict, list)):
             body_str = json.dumps(entry.data, ensure_ascii=False)
         else:
             body_str = str(entry.data)
-        escaped = body_str.replace("'", "'\\''")
-        parts.append(f"-d '{escaped}'")
+        parts.append(f"-d '{_escape_single_quoted(body_str)}'")
 
     return " ".join(parts)
 
@@ -164,23 +240,125 @@ def generate_report(
     return report
 
 
-def format_report(report: dict[str, list[str]]) -> str:
+def _report_lines(sections: Iterable[tuple[str, int, Iterable[str]]]) -> Iterator[str]:
+    """Yield report lines for (failure type, count, curl commands) sections."""
+    for failure_type, count, curls in sections:
+        yield f"## {failure_type} ({count} occurrence(s))"
+        yield ""
+        for i, cmd in enumerate(curls, 1):
+            yield f"### Example {i}"
+            yield cmd
+            yield ""
+        yield ""
+
+
+def format_report(report: dict[str, list[str]], max_chars: int | None = None) -> str:
     """
     Format a report as human-readable text.
 
     Args:
         report: Output from generate_report.
+        max_chars: If set, return only the first max_chars characters; lines
+            past that point are never formatted.
 
     Returns:
         Formatted string with failure types and curl commands.
     """
+    if max_chars is None:
+        # One string per failure type, not one per line
+        blocks = [
+            f"## {failure_type} ({len(curls)} occurrence(s))\n\n"
+            + "".join([f"### Example {i}\n{cmd}\n\n" for i, cmd in enumerate(curls, 1)])
+            for failure_type, curls in sorted(report.items())
+        ]
+        return "\n".join(blocks).strip()
+
     lines: list[str] = []
-    for failure_type, curls in sorted(report.items()):
-        lines.append(f"## {failure_type} ({len(curls)} occurrence(s))")
-        lines.append("")
-        for i, cmd in enumerate(curls, 1):
-            lines.append(f"### Example {i}")
-            lines.append(cmd)
-            lines.append("")
-        lines.append("")
-    return "\n".join(lines).strip()
+    size = 0
+    sections = ((t, len(curls), curls) for t, curls in sorted(report.items()))
+    for line in _report_lines(sections):
+        lines.append(line)
+        size += len(line) + 1
+        # Stop on a non-blank line so the trailing strip cannot shorten the text
+        if size > max_chars and line.strip():
+            break
+    return "\n".join(lines).strip()[:max_chars]
+
+
+def stream_report(entries: list[ExecutionLogEntry], out: TextIO) -> int:
+    """
+    Write the formatted report for entries to out as it is generated.
+
+    Writes the same text as format_report(generate_report(entries)), but
+    never holds the report in memory: each curl command is built just
+    before it is written.
+
+    Args:
+        entries: List of ExecutionLogEntry with request and result.
+        out: Writable text stream (e.g. an open file).
+
+    Returns:
+        Number of failures written.
+    """
+    grouped = group_failures_by_type(entries)
+    sections = (
+        (failure_type.value, len(failed), map(to_curl, failed))
+        for failure_type, failed in sorted(grouped.items(), key=lambda item: item[0].value)
+    )
+    # Blank lines are held back until more text follows, so leading and
+    # trailing ones are dropped exactly as format_report's strip() does
+    pending = 0
+    started = False
+    for line in _report_lines(sections):
+        if not line:
+            pending += 1
+            continue
+        if started:
+            out.write("\n" * (pending + 1))
+        out.write(line)
+        started = True
+        pending = 0
+    return sum(len(failed) for failed in grouped.values())
+
+
+def _jsonl_line(record: dict[str, str]) -> bytes:
+    """Serialize one JSONL record, with orjson when it can encode it."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(record) + b"\n"
+        except orjson.JSONEncodeError:  # e.g. lone surrogates from spec strings
+            pass
+    # ASCII escapes encode any str, surrogates included
+    return json.dumps(record).encode("ascii") + b"\n"
+
+
+def write_report_jsonl(entries: list[ExecutionLogEntry], out: BinaryIO) -> int:
+    """
+    Write one JSON line per failure to out, for programmatic consumers.
+
+    Each line is {"type": <failure type>, "curl": <curl command>}, in entry
+    order. Entries are visited once and nothing is accumulated, so memory
+    stays flat however many failures there are. Classifications are reused
+    and cached on the entries as in group_failures_by_type.
+
+    Args:
+        entries: List of ExecutionLogEntry with request and result.
+        out: Writable binary stream (e.g. a file opened with "wb").
+
+    Returns:
+        Number of failures written.
+    """
+    count = 0
+    for entry in entries:
+        classification = entry.classification
+        if classification is None:
+            result = entry._get_result()
+            if result is None:
+                continue
+            classification = entry.classification = classify(result)
+        if not classification.is_failure:
+            continue
+        record = {"type": classification.failure_type.value, "curl": to_curl(entry)}
+        out.write(_jsonl_line(record))
+        count += 1
+    return count
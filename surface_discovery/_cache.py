@@ -0,0 +1,50 @@
+"""TTL cache for parsed OpenAPI specs, revalidated with conditional GETs."""
+from __future__ import annotations
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from surface_discovery.openapi_parser import Endpoint, _fetch_spec, _parse_spec_response
+
+# spec_url -> (fetched_at, endpoints, validator headers for revalidation)
+_CACHE: Dict[str, Tuple[float, List[Endpoint], Dict[str, str]]] = {}
+_LOCK = threading.Lock()
+
+
+def cached_fetch_and_parse(url: str, ttl: float = 300) -> List[Endpoint]:
+    """
+    Fetch and parse an OpenAPI spec, reusing the parsed endpoints for `ttl` seconds.
+
+    Once an entry expires it is revalidated with If-None-Match / If-Modified-Since,
+    so an unchanged spec (304) costs one round-trip and no re-parse.
+    """
+    with _LOCK:
+        cached = _CACHE.get(url)
+
+    if cached and time.monotonic() - cached[0] < ttl:
+        return list(cached[1])
+
+    headers = cached[2] if cached else None
+    response = _fetch_spec(url, headers=headers)
+
+    if cached and response.status_code == 304:
+        endpoints = cached[1]
+        validators = cached[2]
+    else:
+        endpoints = _parse_spec_response(response)
+        validators = {}
+        if "ETag" in response.headers:
+            validators["If-None-Match"] = response.headers["ETag"]
+        if "Last-Modified" in response.headers:
+            validators["If-Modified-Since"] = response.headers["Last-Modified"]
+
+    with _LOCK:
+        _CACHE[url] = (time.monotonic(), endpoints, validators)
+
+    return list(endpoints)
+
+
+def clear_cache() -> None:
+    """Drop all cached specs."""
+    with _LOCK:
+        _CACHE.clear()
@@ -1,12 +1,38 @@
 """OpenAPI spec parser with $ref resolution and robust error handling."""
 from __future__ import annotations
+import atexit
 import json
-from dataclasses import dataclass
+import mmap
+import operator
+import os
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
 
+try:
+    import orjson
+except ImportError:  # optional: faster spec decoding
+    orjson = None
 
-@dataclass
+# Pooled session for spec fetches, so repeated fetches and cache
+# revalidations of the same spec reuse the connection
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+atexit.register(_SESSION.close)
+
+# Shared read-only default for lookups, so a miss does not build a new dict
+_EMPTY: Dict[str, Any] = {}
+
+# Path item keys that are operations; anything else (summary, parameters, ...) is skipped
+_HTTP_METHODS = frozenset(("get", "post", "put", "patch", "delete", "head", "options", "trace"))
+
+# Fields every well-formed parameter object has ("required" is often omitted)
+_NAME_AND_IN = operator.itemgetter("name", "in")
+
+
+@dataclass(slots=True)
 class Parameter:
     name: str
     location: str
@@ -15,19 +41,15 @@ class Parameter:
     schema: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Endpoint:
     path: str
     method: str
     summary: Optional[str] = None
-    parameters: List[Parameter] = None
+    parameters: List[Parameter] = field(default_factory=list)
     request_body_schema: Optional[Dict[str, Any]] = None
     operation_id: Optional[str] = None
 
-    def __post_init__(self):
-        if self.parameters is None:
-            self.parameters = []
-
 
 def resolve_refs(schema: Any, spec: Dict[str, Any]) -> Any:
     """Resolve all $ref in schema recursively."""
@@ -40,7 +62,7 @@ def resolve_refs(schema: Any, spec: Dict[str, Any]) -> Any:
             parts = ref[2:].split("/")
             obj = spec
             for part in parts:
-                obj = obj.get(part, {})
+                obj = obj.get(part, _EMPTY)
             return resolve_refs(obj, spec)
     
     result = {}
@@ -65,12 +87,18 @@ def _parse_parameters(params_data: Any, spec: Dict[str, Any]) -> List[Parameter]
         for p in params_data:
             if not isinstance(p, dict):
                 continue
+            try:
+                name, location = _NAME_AND_IN(p)
+            except KeyError:
+                name, location = p.get("name", ""), p.get("in", "")
+            schema = p.get("schema")
+            has_schema = isinstance(schema, dict)
             params.append(Parameter(
-                name=p.get("name", ""),
-                location=p.get("in", ""),
-                param_type=p.get("schema", {}).get("type") if isinstance(p.get("schema"), dict) else None,
+                name=name,
+                location=location,
+                param_type=schema.get("type") if has_schema else None,
                 required=p.get("required", False),
-                schema=resolve_refs(p.get("schema", {}), spec) if isinstance(p.get("schema"), dict) else {}
+                schema=resolve_refs(schema, spec) if has_schema else {}
             ))
         return params
     
@@ -86,39 +114,67 @@ def _parse_request_body(req_body: Any, spec: Dict[str, Any]) -> Optional[Dict[st
     if not req_body or not isinstance(req_body, dict):
         return None
     
-    content = req_body.get("content", {})
+    content = req_body.get("content", _EMPTY)
     if not isinstance(content, dict):
         return None
     
-    # Try to find JSON content type
+    # Plain application/json is by far the common case: one key lookup
+    ct_spec = content.get("application/json")
+    if isinstance(ct_spec, dict):
+        schema = ct_spec.get("schema", _EMPTY)
+        if isinstance(schema, dict):
+            return resolve_refs(schema, spec)
+    
+    # Otherwise try any other JSON content type
     for ct, ct_spec in content.items():
         if not isinstance(ct_spec, dict):
             continue
         if "json" in ct.lower():
-            schema = ct_spec.get("schema", {})
+            schema = ct_spec.get("schema", _EMPTY)
             if isinstance(schema, dict):
                 return resolve_refs(schema, spec)
     
     return None
 
 
-def fetch_and_parse(openapi_url: str) -> List[Endpoint]:
-    """Fetch and parse OpenAPI spec from URL with robust error handling."""
+def _loads(content: bytes | str | memoryview) -> Any:
+    """Decode JSON with orjson when installed; stdlib json handles what it rejects."""
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    if isinstance(content, memoryview):
+        content = bytes(content)
+    return json.loads(content)
+
+
+def _fetch_spec(openapi_url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    """GET the OpenAPI spec, turning transport/HTTP errors into ValueError."""
     try:
-        response = requests.get(openapi_url, timeout=10)
+        response = _SESSION.get(openapi_url, headers=headers, timeout=10)
         response.raise_for_status()
     except requests.RequestException as e:
         raise ValueError(f"Failed to fetch OpenAPI spec from {openapi_url}: {e}")
-    
+    return response
+
+
+def _parse_spec_response(response: requests.Response) -> List[Endpoint]:
+    """Decode a fetched spec response and parse its endpoints."""
     try:
-        spec = response.json()
+        spec = _loads(response.content)
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON in OpenAPI spec: {e}")
     
+    return _parse_spec(spec)
+
+
+def _parse_spec(spec: Any) -> List[Endpoint]:
+    """Parse endpoints from an already-loaded OpenAPI spec object."""
     if not isinstance(spec, dict):
         raise ValueError("OpenAPI spec must be a JSON object")
     
-    paths = spec.get("paths", {})
+    paths = spec.get("paths", _EMPTY)
     if not isinstance(paths, dict):
         raise ValueError("'paths' in OpenAPI spec must be an object")
     
@@ -132,7 +188,7 @@ def fetch_and_parse(openapi_url: str) -> List[Endpoint]:
         # Iterate through HTTP methods
         for method, operation in path_item.items():
             # Skip non-method keys like 'summary', 'description', 'parameters', '$ref'
-            if method.lower() not in ['get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace']:
+            if method.lower() not in _HTTP_METHODS:
                 continue
             
             # Ensure operation is a dict
@@ -141,7 +197,7 @@ def fetch_and_parse(openapi_url: str) -> List[Endpoint]:
                 continue
             
             # Parse parameters
-            params = _parse_parameters(operation.get("parameters", []), spec)
+            params = _parse_parameters(operation.get("parameters"), spec)
             
             # Parse request body
             body_schema = _parse_request_body(operation.get("requestBody"), spec)
@@ -161,18 +217,29 @@ def fetch_and_parse(openapi_url: str) -> List[Endpoint]:
     return endpoints
 
 
+def fetch_and_parse(openapi_url: str) -> List[Endpoint]:
+    """Fetch and parse OpenAPI spec from URL with robust error handling."""
+    return _parse_spec_response(_fetch_spec(openapi_url))
+
+
 def parse_from_file(file_path: str) -> List[Endpoint]:
     """Parse OpenAPI spec from a local file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            # Try JSON first
-            try:
-                spec = json.load(f)
-            except json.JSONDecodeError:
-                # Try YAML
-                f.seek(0)
-                import yaml
-                spec = yaml.safe_load(f)
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                spec = None  # mmap rejects empty files
+            else:
+                # Map the file rather than reading it into a str; orjson
+                # parses the mapped bytes in place
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Try JSON first
+                    try:
+                        with memoryview(mm) as view:
+                            spec = _loads(view)
+                    except json.JSONDecodeError:
+                        # Try YAML
+                        import yaml
+                        spec = yaml.safe_load(mm)
     except FileNotFoundError:
         raise ValueError(f"File not found: {file_path}")
     except Exception as e:
@@ -181,36 +248,4 @@ def parse_from_file(file_path: str) -> List[Endpoint]:
     if not isinstance(spec, dict):
         raise ValueError("OpenAPI spec must be a JSON/YAML object")
     
-    paths = spec.get("paths", {})
-    if not isinstance(paths, dict):
-        raise ValueError("'paths' in OpenAPI spec must be an object")
-    
-    endpoints = []
-    
-    for path, path_item in paths.items():
-        if not isinstance(path_item, dict):
-            continue
-        
-        for method, operation in path_item.items():
-            if method.lower() not in ['get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace']:
-                continue
-            
-            if not isinstance(operation, dict):
-                continue
-            
-            params = _parse_parameters(operation.get("parameters", []), spec)
-            body_schema = _parse_request_body(operation.get("requestBody"), spec)
-            
-            endpoints.append(Endpoint(
-                path=path,
-                method=method.lower(),
-                summary=operation.get("summary"),
-                parameters=params,
-                request_body_schema=body_schema,
-                operation_id=operation.get("operationId")
-            ))
-    
-    if not endpoints:
-        raise ValueError("No valid endpoints found in OpenAPI spec")
-    
-    return endpoints
\ No newline at end of file
+    return _parse_spec(spec)
\ No newline at end of file